@@ -0,0 +1,28 @@
+import string
+
+ALPHABET = string.digits + string.ascii_letters
+BASE = len(ALPHABET)
+INDEX = {char: position for position, char in enumerate(ALPHABET)}
+MAX_ID = 2 ** 63 - 1
+
+
+class Base62Converter:
+    regex = '[0-9a-zA-Z]+'
+
+    def to_python(self, value):
+        number = 0
+        for char in value:
+            number = number * BASE + INDEX[char]
+        if number > MAX_ID:
+            raise ValueError
+        return number
+
+    def to_url(self, value):
+        value = int(value)
+        if value == 0:
+            return ALPHABET[0]
+        chars = []
+        while value:
+            value, remainder = divmod(value, BASE)
+            chars.append(ALPHABET[remainder])
+        return ''.join(reversed(chars))
@@ -1,15 +1,33 @@
 import base64
+import binascii
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from rest_framework import serializers
 
+IMAGE_EXTENSIONS = frozenset(('png', 'jpeg', 'jpg', 'gif', 'webp'))
+
 
 class Base64ImageField(serializers.ImageField):
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
+            format, _, imgstr = data.partition(';base64,')
             ext = format.split('/')[-1]
+            if ext not in IMAGE_EXTENSIONS:
+                raise serializers.ValidationError(
+                    'Неподдерживаемый формат изображения')
+
+            decoded_size = len(imgstr) * 3 // 4 - imgstr.count('=', -2)
+            if decoded_size > settings.MAX_IMAGE_SIZE:
+                raise serializers.ValidationError(
+                    'Изображение не должно превышать '
+                    f'{settings.MAX_IMAGE_SIZE // (1024 * 1024)} МБ')
 
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
+            try:
+                data = ContentFile(base64.b64decode(imgstr),
+                                   name='temp.' + ext)
+            except binascii.Error:
+                raise serializers.ValidationError(
+                    'Некорректные данные изображения')
 
         return super().to_internal_value(data)
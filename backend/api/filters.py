@@ -0,0 +1,42 @@
+from django.db.models import Exists, OuterRef
+from django_filters import rest_framework as filters
+
+from recipes.models import Recipe
+
+
+class FastFilterBackend(filters.DjangoFilterBackend):
+    def to_html(self, request, queryset, view):
+        return ''
+
+    def filter_queryset(self, request, queryset, view):
+        if not request.query_params:
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+
+class RecipeFilter(filters.FilterSet):
+    is_favorited = filters.BooleanFilter(method='filter_is_favorited')
+    is_in_shopping_cart = filters.BooleanFilter(
+        method='filter_is_in_shopping_cart')
+    author = filters.NumberFilter(field_name='author')
+    tags = filters.CharFilter(method='filter_tags')
+
+    class Meta:
+        model = Recipe
+        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags')
+
+    def filter_is_favorited(self, queryset, name, value):
+        if value and self.request.user.is_authenticated:
+            return queryset.filter(is_favorited=True)
+        return queryset
+
+    def filter_is_in_shopping_cart(self, queryset, name, value):
+        if value and self.request.user.is_authenticated:
+            return queryset.filter(is_in_shopping_cart=True)
+        return queryset
+
+    def filter_tags(self, queryset, name, value):
+        tags = self.data.getlist('tags')
+        return queryset.filter(Exists(
+            Recipe.tags.through.objects.filter(
+                recipe_id=OuterRef('pk'), tag__slug__in=tags)))
@@ -1,6 +1,12 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 
+TAGS_LIST_CACHE_KEY = 'tags_list'
+INGREDIENTS_LIST_CACHE_KEY = 'ingredients_list'
+
 
 class CreateDestroyObjectMixin:
 
@@ -26,16 +32,28 @@ class CreateDestroyObjectMixin:
 
     @staticmethod
     def destroy_object(
-            input_serializer,
-            serializer_data,
             model,
-            extra_data,
-            serializer_context=None
+            lookup,
+            target_model,
+            target_id,
+            error_message
     ):
-        serializer = input_serializer(
-            data=serializer_data,
-            context=serializer_context or {}
-        )
-        serializer.is_valid(raise_exception=True)
-        model.objects.get(**(serializer_data | extra_data)).delete()
+        deleted, _ = model.objects.filter(**lookup).delete()
+        if not deleted:
+            if not target_model.objects.filter(id=target_id).exists():
+                raise NotFound()
+            raise ValidationError(error_message)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CachedListMixin:
+    list_cache_key = None
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+        data = cache.get(self.list_cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(self.list_cache_key, data, settings.LIST_CACHE_TIMEOUT)
+        return Response(data)
@@ -1,11 +1,11 @@
 from rest_framework import permissions
 
-ALLOWED_METHODS = ["PATCH", "DELETE", "PUT"]
+ALLOWED_METHODS = frozenset(("PATCH", "DELETE", "PUT"))
 
 
 class IsAuthor(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method not in ALLOWED_METHODS
-            or request.method in ALLOWED_METHODS and obj.author == request.user
+            or obj.author_id == request.user.id
         )
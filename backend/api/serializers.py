@@ -1,4 +1,7 @@
-from django.db import transaction
+import copy
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -8,19 +11,42 @@ from rest_framework.relations import PrimaryKeyRelatedField
 from api.fields import Base64ImageField
 from api.validators import username_validator
 from foodgram import settings
-from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
-                            ShoppingCart, Tag)
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, Tag
 from users.models import CustomUser, Subscription
 
+MAX_SMALL_INTEGER = 32767
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """Build the field map once per class and hand out shallow copies.
+
+    Nested serializers are deep-copied so that their children are bound
+    to the serializer being rendered. Fields must not be added, removed
+    or changed per instance.
+    """
 
-class TagSerializer(serializers.ModelSerializer):
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {
+            name: (copy.deepcopy(field)
+                   if isinstance(field, serializers.BaseSerializer)
+                   else copy.copy(field))
+            for name, field in self._fields_cache[cls].items()
+        }
+
+
+class TagSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Tag
         fields = ('id', 'name', 'slug')
         read_only_fields = ('id',)
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(CachedFieldsModelSerializer):
     username = serializers.CharField(validators=(username_validator,))
     is_subscribed = serializers.SerializerMethodField()
 
@@ -31,19 +57,24 @@ class CustomUserSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'is_subscribed')
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         user = self.context['request'].user
-        if user.is_authenticated:
-            return user.user_subscriptions.filter(author=obj).exists()
-        return False
+        if not user.is_authenticated:
+            return False
+        if '_subscribed_ids' not in self.context:
+            self.context['_subscribed_ids'] = set(
+                user.user_subscriptions.values_list('author_id', flat=True))
+        return obj.id in self.context['_subscribed_ids']
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(CachedFieldsModelSerializer):
     class Meta:
         fields = '__all__'
         model = Ingredient
 
 
-class RecipeIngredientSerializer(serializers.ModelSerializer):
+class RecipeIngredientSerializer(CachedFieldsModelSerializer):
     id = serializers.ReadOnlyField(source='ingredient.id')
     name = serializers.CharField(source='ingredient.name', required=False)
     measurement_unit = serializers.CharField(
@@ -54,13 +85,14 @@ class RecipeIngredientSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount')
 
 
-class RecipeSerializer(serializers.ModelSerializer):
-    tags = TagSerializer(many=True)
+class RecipeSerializer(CachedFieldsModelSerializer):
+    tags = serializers.SerializerMethodField()
     author = CustomUserSerializer(read_only=True)
     ingredients = RecipeIngredientSerializer(
         many=True, source='ingredients_in_recipe')
-    is_favorited = serializers.SerializerMethodField()
-    is_in_shopping_cart = serializers.SerializerMethodField()
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
+    is_in_shopping_cart = serializers.BooleanField(read_only=True,
+                                                   default=False)
     image = serializers.ImageField()
 
     class Meta:
@@ -69,20 +101,20 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'is_in_shopping_cart', 'name', 'image', 'text',
                   'cooking_time')
 
-    def get_is_favorited(self, obj):
-        user = self.context['request'].user
-        return user.is_authenticated and Favorite.objects.filter(
-            user=user, recipe=obj).exists()
-
-    def get_is_in_shopping_cart(self, obj):
-        user = self.context['request'].user
-        return user.is_authenticated and ShoppingCart.objects.filter(
-            user=user, recipe=obj).exists()
+    def get_tags(self, obj):
+        serialized_tags = self.context.setdefault('_serialized_tags', {})
+        tags = []
+        for tag in obj.tags.all():
+            if tag.id not in serialized_tags:
+                serialized_tags[tag.id] = TagSerializer(tag).data
+            tags.append(serialized_tags[tag.id])
+        return tags
 
 
 class IngredientForRecipeSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
-    amount = serializers.IntegerField(min_value=1)
+    id = serializers.IntegerField()
+    amount = serializers.IntegerField(min_value=1,
+                                      max_value=MAX_SMALL_INTEGER)
 
     class Meta:
         model = Ingredient
@@ -96,7 +128,8 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
     ingredients = IngredientForRecipeSerializer(many=True)
     tags = PrimaryKeyRelatedField(queryset=Tag.objects.all(),
                                   many=True)
-    cooking_time = serializers.IntegerField(required=True, min_value=1)
+    cooking_time = serializers.IntegerField(required=True, min_value=1,
+                                            max_value=MAX_SMALL_INTEGER)
     image = Base64ImageField(required=True, allow_null=False,
                              allow_empty_file=False)
 
@@ -112,13 +145,17 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         )
 
     def validate(self, attrs):
-        ingredients_values = []
         if not attrs.get('ingredients'):
             raise ValidationError('Пожалуйста установите ингредиенты')
-        for item in attrs['ingredients']:
-            ingredients_values.append(item.get('id'))
+        ingredients_values = [item['id'] for item in attrs['ingredients']]
         if len(ingredients_values) != len(set(ingredients_values)):
             raise ValidationError('Ингредиенты должны быть уникальными')
+        existing_ids = set(Ingredient.objects.filter(
+            id__in=ingredients_values).values_list('id', flat=True))
+        missing_ids = set(ingredients_values) - existing_ids
+        if missing_ids:
+            raise ValidationError(
+                f'Ингредиенты не найдены: {sorted(missing_ids)}')
 
         if not attrs.get('tags'):
             raise ValidationError('Пожалуйста установите тэги')
@@ -130,6 +167,13 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    @staticmethod
+    def get_amounts(ingredients):
+        return {
+            ingredient['id']: ingredient['amount']
+            for ingredient in ingredients
+        }
+
     @transaction.atomic
     def create(self, validated_data):
         recipe = Recipe.objects.create(
@@ -139,10 +183,8 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
             cooking_time=validated_data['cooking_time'],
             image=validated_data.get('image', None))
         recipe.tags.set(validated_data['tags'])
-
-        self.set_ingredients_to_recipe(
-            recipe=recipe,
-            ingredients=validated_data['ingredients'])
+        recipe.add_ingredients(
+            self.get_amounts(validated_data['ingredients']))
         return recipe
 
     @transaction.atomic
@@ -152,40 +194,20 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
         instance = super().update(instance, validated_data)
 
-        instance.ingredients.clear()
-        self.set_ingredients_to_recipe(
-            recipe=instance,
-            ingredients=ingredients_data
-        )
+        instance.set_ingredients(self.get_amounts(ingredients_data))
 
         instance.tags.set(tags_data)
 
         return instance
 
-    @staticmethod
-    def set_ingredients_to_recipe(recipe, ingredients):
-        with transaction.atomic():
-            ingredient_list = []
-
-            recipe.ingredients.clear()
-            for ingredient in ingredients:
-                ingredient_list.append(
-                    IngredientInRecipe(
-                        recipe=recipe,
-                        ingredient=ingredient['id'],
-                        amount=ingredient['amount']
-                    )
-                )
-
-            IngredientInRecipe.objects.bulk_create(ingredient_list)
-
     def to_representation(self, instance):
-        return RecipeSerializer(
-            instance,
-            context={'request': self.context['request']}).data
+        request = self.context['request']
+        instance = Recipe.objects.with_related().with_user_flags(
+            request.user).get(pk=instance.pk)
+        return RecipeSerializer(instance, context={'request': request}).data
 
 
-class RecipeMinifiedSerializer(serializers.ModelSerializer):
+class RecipeMinifiedSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Recipe
         fields = ('id', 'name', 'image', 'cooking_time')
@@ -194,13 +216,22 @@ class RecipeMinifiedSerializer(serializers.ModelSerializer):
 class UserWithRecipesSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.BooleanField(default=True)
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.IntegerField(
-        source='recipes.count', read_only=True)
+    recipes_count = serializers.IntegerField(read_only=True)
+
+    @staticmethod
+    def get_recipes_limit(request):
+        recipes_limit = request.query_params.get('recipes_limit', '')
+        if recipes_limit.isdecimal() and int(recipes_limit) > 0:
+            return int(recipes_limit)
+        return settings.REST_FRAMEWORK['PAGE_SIZE']
 
     def get_recipes(self, obj):
-        limit = self.context['request'].query_params.get(
-            'recipes_limit') or settings.REST_FRAMEWORK['PAGE_SIZE']
-        recipes = obj.recipes.all()[:int(limit)]
+        if hasattr(obj, 'limited_recipes'):
+            recipes = obj.limited_recipes
+        else:
+            limit = self.get_recipes_limit(self.context['request'])
+            recipes = obj.recipes.only(
+                *RecipeMinifiedSerializer.Meta.fields).order_by('-id')[:limit]
         return RecipeMinifiedSerializer(recipes, many=True).data
 
     class Meta:
@@ -228,30 +259,24 @@ class SubscribeCreateDeleteSerializer(serializers.ModelSerializer):
         )
 
     def validate(self, attrs):
-        author = get_object_or_404(CustomUser, id=attrs['author_id'])
-        subscription_presence = (
-            Subscription.objects.filter(
-                user=self.context['request'].user,
-                author=author).exists())
-        if self.context['request'].method == 'POST':
-            if author == self.context['request'].user:
-                raise ValidationError(
-                    'Вы не можете подписаться на самого себя')
-            if subscription_presence:
-                raise ValidationError('Вы уже подписаны на этого пользователя')
-        else:
-            if not subscription_presence:
-                raise ValidationError(
-                    'Вы еще не подписаны на этого пользователя')
-
+        if attrs['author_id'] == self.context['request'].user.id:
+            raise ValidationError('Вы не можете подписаться на самого себя')
         return attrs
 
     def create(self, validated_data):
-        subscribe = Subscription.objects.create(
-            user=self.context['request'].user,
-            author_id=validated_data['author_id']
+        author = get_object_or_404(
+            CustomUser.objects.annotate(recipes_count=Count('recipes')),
+            id=validated_data['author_id']
         )
-        return subscribe.author
+        try:
+            with transaction.atomic():
+                Subscription.objects.create(
+                    user=self.context['request'].user,
+                    author=author
+                )
+        except IntegrityError:
+            raise ValidationError('Вы уже подписаны на этого пользователя')
+        return author
 
 
 class ObjectWithRecipeUserCreateDeleteSerializer(serializers.ModelSerializer):
@@ -263,29 +288,22 @@ class ObjectWithRecipeUserCreateDeleteSerializer(serializers.ModelSerializer):
             'pk',
         )
 
-    def validate(self, attrs):
-        pk = self.context['request'].parser_context['kwargs']['pk']
-        recipe = get_object_or_404(Recipe, id=pk)
-        obj_model_presence = self.context['model'].objects.filter(
-            user=self.context['request'].user, recipe=recipe).exists()
-        if self.context['request'].method == 'POST':
-            if obj_model_presence:
-                raise ValidationError(
-                    f"Вы уже добавиляли этот рецепт в "
-                    f"{self.context['model'].__name__}.")
-        else:
-            if not obj_model_presence:
-                raise ValidationError(
-                    f"Вы еще не добавиляли этот рецепт в "
-                    f"{self.context['model'].__name__}.")
-        return attrs
-
     def create(self, validated_data):
-        obj = self.context['model'].objects.create(
-            user=self.context['request'].user,
-            recipe_id=self.context['request'].parser_context['kwargs']['pk']
+        recipe = get_object_or_404(
+            Recipe.objects.only(*RecipeMinifiedSerializer.Meta.fields),
+            id=self.context['request'].parser_context['kwargs']['pk']
         )
-        return obj.recipe
+        try:
+            with transaction.atomic():
+                self.context['model'].objects.create(
+                    user=self.context['request'].user,
+                    recipe=recipe
+                )
+        except IntegrityError:
+            raise ValidationError(
+                f"Вы уже добавиляли этот рецепт в "
+                f"{self.context['model'].__name__}.")
+        return recipe
 
     def to_representation(self, instance):
         return RecipeMinifiedSerializer(instance).data
@@ -0,0 +1,16 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.mixins import INGREDIENTS_LIST_CACHE_KEY, TAGS_LIST_CACHE_KEY
+from recipes.models import Ingredient, Tag
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def clear_tags_cache(**kwargs):
+    cache.delete(TAGS_LIST_CACHE_KEY)
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def clear_ingredients_cache(**kwargs):
+    cache.delete(INGREDIENTS_LIST_CACHE_KEY)
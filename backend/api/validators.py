@@ -1,7 +1,11 @@
+import re
+
 from django.core.validators import RegexValidator
 
+USERNAME_REGEX = re.compile(r'^[\w.@+-]+\Z')
+
 username_validator = RegexValidator(
-    regex=r'^[\w.@+-]+\Z',
+    regex=USERNAME_REGEX,
     message='Недопустимые символы в имени',
     code='invalid_username'
 )
@@ -1,9 +1,12 @@
-import io
-
-from django.db.models import Sum, Q
-from django.http import HttpResponse
-from django.shortcuts import get_object_or_404, redirect
-from django_filters.rest_framework import DjangoFilterBackend
+from hashlib import md5
+
+from django.db.models import (Count, Exists, OuterRef, Prefetch, Subquery,
+                              Sum)
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from djoser import views as joser_views
 from rest_framework import status, viewsets
 from rest_framework.views import APIView
@@ -15,7 +18,9 @@ from rest_framework.permissions import (IsAuthenticated,
 from rest_framework.response import Response
 from rest_framework import permissions
 
-from api.mixins import CreateDestroyObjectMixin
+from api.filters import FastFilterBackend, RecipeFilter
+from api.mixins import (INGREDIENTS_LIST_CACHE_KEY, TAGS_LIST_CACHE_KEY,
+                        CachedListMixin, CreateDestroyObjectMixin)
 from api.permissions import IsAuthor
 from api.serializers import (AvatarSerializer, CustomUserSerializer,
                              IngredientSerializer,
@@ -25,19 +30,34 @@ from api.serializers import (AvatarSerializer, CustomUserSerializer,
                              RecipeSerializer,
                              SubscribeCreateDeleteSerializer, TagSerializer,
                              UserWithRecipesSerializer)
-from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
+from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
+                            ShoppingCart, Tag)
 from users.models import CustomUser, Subscription
 
 
+def user_etag(request, *args, **kwargs):
+    user = request.user
+    return md5(
+        f'{user.pk}|{user.email}|{user.username}|{user.first_name}|'
+        f'{user.last_name}|{user.avatar}'.encode()
+    ).hexdigest()
+
+
 class CustomUserViewSet(joser_views.UserViewSet):
     serializer_class = CustomUserSerializer
 
     def get_queryset(self):
-        return CustomUser.objects.all()
+        queryset = CustomUser.objects.all()
+        if self.request.user.is_authenticated:
+            queryset = queryset.annotate(is_subscribed=Exists(
+                Subscription.objects.filter(
+                    user=self.request.user, author=OuterRef('pk'))))
+        return queryset
 
     @action(detail=False,
             methods=['GET'],
             permission_classes=[permissions.IsAuthenticated])
+    @method_decorator(condition(etag_func=user_etag))
     def me(self, request):
         serializer = CustomUserSerializer(
             request.user, context={'request': request})
@@ -62,35 +82,21 @@ class CustomUserViewSet(joser_views.UserViewSet):
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.with_related()
     serializer_class = RecipeSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = (FastFilterBackend,)
+    filterset_class = RecipeFilter
     permission_classes = (IsAuthor, IsAuthenticatedOrReadOnly)
 
     def get_queryset(self):
-        queryset = self.queryset
-        is_favorited = self.request.query_params.get('is_favorited')
-        is_in_shopping_cart = self.request.query_params.get(
-            'is_in_shopping_cart')
-        author = self.request.query_params.get('author')
-        tags = self.request.query_params.getlist('tags')
-
-        if is_favorited is not None and self.request.user.is_authenticated:
-            queryset = queryset.filter(favorite__user=self.request.user)
-        if (is_in_shopping_cart is not None
-                and self.request.user.is_authenticated):
-            queryset = queryset.filter(shoppingcart__user=self.request.user)
-        if author is not None:
-            queryset = queryset.filter(author__id=author)
-        if tags:
-            queryset = queryset.filter(tags__slug__in=tags).distinct()
-
-        return queryset
+        return self.queryset.with_user_flags(self.request.user)
 
     @action(methods=["GET"], detail=True, url_path="get-link")
     def get_link(self, request, pk):
-        recipe = get_object_or_404(Recipe, id=pk)
-        short_link = f"{request.scheme}://{request.get_host()}/s/{recipe.id}/"
+        if not Recipe.objects.filter(id=pk).exists():
+            raise Http404
+        short_link = request.build_absolute_uri(
+            reverse('get_recipe_by_short_link', kwargs={'pk': pk}))
         return Response({"short-link": short_link})
 
     def get_serializer_class(self, *args, **kwargs):
@@ -102,18 +108,19 @@ class RecipeViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user)
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
-    http_method_names = ['get']
+    list_cache_key = TAGS_LIST_CACHE_KEY
 
 
-class IngredientViewSet(viewsets.ModelViewSet):
+class IngredientViewSet(CachedListMixin,
+                        viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
-    http_method_names = ['get']
+    list_cache_key = INGREDIENTS_LIST_CACHE_KEY
 
     def get_queryset(self):
         queryset = self.queryset
@@ -134,38 +141,34 @@ class ShoppingCartViewSet(CreateDestroyObjectMixin,
 
     def destroy(self, request, pk):
         return self.destroy_object(
-            input_serializer=ObjectWithRecipeUserCreateDeleteSerializer,
-            serializer_data={'recipe_id': pk},
-            serializer_context={'request': request, 'model': ShoppingCart},
             model=ShoppingCart,
-            extra_data={'user': request.user}
+            lookup={'user': request.user, 'recipe_id': pk},
+            target_model=Recipe,
+            target_id=pk,
+            error_message='Вы еще не добавиляли этот рецепт в ShoppingCart.'
         )
 
     @action(detail=False, methods=['get'])
     def download_shopping_cart(self, request):
-        recipes_id = ShoppingCart.objects.filter(
-            user=request.user).values_list('recipe__pk', flat=True)
-        ingredients = Ingredient.objects.filter(
-            ingredients_in_recipe__recipe_id__in=recipes_id
+        ingredients = IngredientInRecipe.objects.filter(
+            recipe__shoppingcart__user=request.user
+        ).values(
+            'ingredient__name', 'ingredient__measurement_unit'
         ).annotate(
-            quantity=Sum('ingredients_in_recipe__amount', filter=Q(
-                ingredients_in_recipe__recipe_id__in=recipes_id
-            ))
+            quantity=Sum('amount')
         ).values_list(
-            'name', 'measurement_unit', 'quantity'
+            'ingredient__name', 'ingredient__measurement_unit', 'quantity'
+        ).order_by('ingredient__name')
+        lines = (
+            f'|{name}| --- |{measurement_unit}| --- |{quantity}|\n'
+            for name, measurement_unit, quantity
+            in ingredients.iterator(chunk_size=500)
         )
-        result = ''
-        for ingredient in ingredients:
-            result += (f'|{ingredient[0]}| --- '
-                       f'|{ingredient[1]}| --- '
-                       f'|{ingredient[2]}|\n')
-        text = io.BytesIO()
-        with io.TextIOWrapper(text, encoding="utf-8", write_through=True) as f:
-            f.write(result)
-            response = HttpResponse(text.getvalue(), content_type="text/plain")
-            response["Content-Disposition"] = ("attachment; "
-                                               "filename=shopping_list.txt")
-            return response
+        response = StreamingHttpResponse(
+            lines, content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = ("attachment; "
+                                           "filename=shopping_list.txt")
+        return response
 
 
 class FavoriteViewSet(CreateDestroyObjectMixin, viewsets.ModelViewSet):
@@ -182,25 +185,42 @@ class FavoriteViewSet(CreateDestroyObjectMixin, viewsets.ModelViewSet):
 
     def destroy(self, request, pk):
         return self.destroy_object(
-            input_serializer=ObjectWithRecipeUserCreateDeleteSerializer,
-            serializer_data={'recipe_id': pk},
-            serializer_context={'request': request, 'model': Favorite},
             model=Favorite,
-            extra_data={'user': request.user}
+            lookup={'user': request.user, 'recipe_id': pk},
+            target_model=Recipe,
+            target_id=pk,
+            error_message='Вы еще не добавиляли этот рецепт в Favorite.'
         )
 
 
 class SubscriptionViewSet(CreateDestroyObjectMixin, viewsets.ModelViewSet):
     permission_classes = (IsAuthenticated,)
+    serializer_class = UserWithRecipesSerializer
+
+    def get_queryset(self):
+        latest_recipe_ids = Recipe.objects.filter(
+            author_id=OuterRef('author_id')
+        ).order_by('-id').values('id')[
+            :UserWithRecipesSerializer.get_recipes_limit(self.request)]
+        return CustomUser.objects.filter(
+            author_subscriptions__user=self.request.user
+        ).only(
+            'id', 'email', 'username', 'first_name', 'last_name', 'avatar'
+        ).annotate(
+            recipes_count=Count('recipes')
+        ).prefetch_related(
+            Prefetch('recipes',
+                     queryset=Recipe.objects.filter(
+                         id__in=Subquery(latest_recipe_ids)
+                     ).only(
+                         *RecipeMinifiedSerializer.Meta.fields, 'author'
+                     ).order_by('-id'),
+                     to_attr='limited_recipes')
+        ).order_by('username')
 
     @action(methods=["GET"], detail=False)
     def subscriptions(self, request, *args, **kwargs):
-        subscribes = Subscription.objects.filter(
-            user=request.user).values_list('author_id', flat=True)
-        self.queryset = CustomUser.objects.prefetch_related('recipes').filter(
-            id__in=subscribes)
-        self.serializer_class = UserWithRecipesSerializer
-        return super().list(request, args, kwargs)
+        return super().list(request, *args, **kwargs)
 
     @action(detail=True, methods=['post'])
     def subscribe(self, request, pk=None):
@@ -215,15 +235,16 @@ class SubscriptionViewSet(CreateDestroyObjectMixin, viewsets.ModelViewSet):
     @action(methods=['DELETE'], detail=True)
     def unsubscribe(self, request, pk=None):
         return self.destroy_object(
-            input_serializer=SubscribeCreateDeleteSerializer,
-            serializer_data={'author_id': pk},
-            serializer_context={'request': request},
             model=Subscription,
-            extra_data={'user': request.user}
+            lookup={'user': request.user, 'author_id': pk},
+            target_model=CustomUser,
+            target_id=pk,
+            error_message='Вы еще не подписаны на этого пользователя'
         )
 
 
 class RecipeShortLinkRedirectView(APIView):
     def get(self, request, pk):
-        recipe = get_object_or_404(Recipe, id=pk)
-        return redirect(f'/recipes/{recipe.id}/')
+        if not Recipe.objects.filter(id=pk).exists():
+            raise Http404
+        return redirect(f'/recipes/{pk}/')
@@ -1,16 +1,22 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, register_converter
 
+from api.converters import Base62Converter
 from api.views import RecipeShortLinkRedirectView
 
+register_converter(Base62Converter, 'base62')
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls', namespace='api')),
+    path('s/r/<base62:pk>/',
+         RecipeShortLinkRedirectView.as_view(),
+         name='get_recipe_by_short_link'),
     path('s/<int:pk>/',
          RecipeShortLinkRedirectView.as_view(),
-         name='get_recipe_by_short_link')
+         name='get_recipe_by_legacy_short_link')
 ]
 
 if settings.DEBUG:
@@ -1,29 +1,90 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Prefetch
 
-from recipes.models import Ingredient, IngredientInRecipe, Recipe, Tag
+from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
+                            ShoppingCart, Tag)
 from users.models import CustomUser
 
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ('name', 'slug')
 
 
 @admin.register(Ingredient)
 class IngredientAdmin(admin.ModelAdmin):
-    pass
+    list_display = ('name', 'measurement_unit')
+    search_fields = ('name',)
+    ordering = ('name',)
+
+
+class RecipeChangeList(ChangeList):
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('text')
+
+
+class IngredientInRecipeInline(admin.TabularInline):
+    model = IngredientInRecipe
+    autocomplete_fields = ('ingredient',)
+    extra = 1
 
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
-    pass
+    inlines = (IngredientInRecipeInline,)
+    list_display = ('id', 'name', 'author', 'cooking_time', 'get_tags',
+                    'get_ingredients')
+    list_select_related = ('author',)
+    list_filter = ('tags',)
+    search_fields = ('name', 'author__username')
+    autocomplete_fields = ('tags',)
+    raw_id_fields = ('author',)
+
+    def get_changelist(self, request, **kwargs):
+        return RecipeChangeList
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'author'
+        ).prefetch_related(
+            'tags',
+            Prefetch('ingredients_in_recipe',
+                     queryset=IngredientInRecipe.objects.select_related(
+                         'ingredient'))
+        )
+
+    @admin.display(description='Теги')
+    def get_tags(self, obj):
+        return ', '.join(tag.name for tag in obj.tags.all())
+
+    @admin.display(description='Ингредиенты')
+    def get_ingredients(self, obj):
+        return ', '.join(
+            item.ingredient.name for item in obj.ingredients_in_recipe.all())
 
 
 @admin.register(CustomUser)
 class CustomUserAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ('username', 'email')
 
 
 @admin.register(IngredientInRecipe)
 class IngredientInRecipeAdmin(admin.ModelAdmin):
-    pass
+    list_display = ('recipe', 'ingredient', 'amount')
+    list_select_related = ('recipe', 'ingredient')
+    raw_id_fields = ('recipe', 'ingredient')
+
+
+@admin.register(Favorite)
+class FavoriteAdmin(admin.ModelAdmin):
+    list_display = ('user', 'recipe')
+    list_select_related = ('user', 'recipe')
+    raw_id_fields = ('user', 'recipe')
+
+
+@admin.register(ShoppingCart)
+class ShoppingCartAdmin(admin.ModelAdmin):
+    list_display = ('user', 'recipe')
+    list_select_related = ('user', 'recipe')
+    raw_id_fields = ('user', 'recipe')
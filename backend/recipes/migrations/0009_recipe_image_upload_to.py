@@ -0,0 +1,18 @@
+# Generated by Django 3.2.3 on 2026-10-15 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=models.ImageField(blank=True, upload_to='recipes/images/%Y/%m/%d/', verbose_name='Ссылка на картинку на сайте'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.3 on 2026-10-15 11:37
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_recipe_image_upload_to'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingredientinrecipe',
+            name='amount',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1, 'Должно быть минимум один')], verbose_name='Количество'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='cooking_time',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1, 'Время готовки минимум одна минута')], verbose_name='Время приготовления (в минутах)'),
+        ),
+    ]
@@ -1,37 +1,107 @@
-from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 
 from users.models import CustomUser
 
-User = get_user_model()
+
+class RecipeQuerySet(models.QuerySet):
+
+    def with_related(self):
+        return self.select_related('author').only(
+            'id', 'name', 'image', 'text', 'cooking_time',
+            'author__id', 'author__email', 'author__username',
+            'author__first_name', 'author__last_name', 'author__avatar'
+        ).prefetch_related(
+            'tags',
+            models.Prefetch(
+                'ingredients_in_recipe',
+                queryset=IngredientInRecipe.objects.select_related(
+                    'ingredient').only(
+                    'id', 'amount', 'recipe',
+                    'ingredient__id', 'ingredient__name',
+                    'ingredient__measurement_unit'))
+        )
+
+    def with_user_flags(self, user):
+        if not user.is_authenticated:
+            return self
+        return self.annotate(
+            is_favorited=models.Exists(Favorite.objects.filter(
+                user=user, recipe=models.OuterRef('pk'))),
+            is_in_shopping_cart=models.Exists(ShoppingCart.objects.filter(
+                user=user, recipe=models.OuterRef('pk')))
+        )
 
 
 class Recipe(models.Model):
-    author = models.ForeignKey(User, on_delete=models.CASCADE,
+    author = models.ForeignKey(CustomUser, on_delete=models.CASCADE,
                                related_name='recipes',
                                verbose_name='Автор рецепта')
-    name = models.TextField('Название', max_length=256)
+    name = models.CharField('Название', max_length=256)
     image = models.ImageField('Ссылка на картинку на сайте',
-                              upload_to='recipes/images/', blank=True)
+                              upload_to='recipes/images/%Y/%m/%d/',
+                              blank=True)
     text = models.TextField('Описание')
     ingredients = models.ManyToManyField('Ingredient',
                                          through='IngredientInRecipe',
                                          verbose_name='Список ингредиентов')
     tags = models.ManyToManyField('Tag', related_name='recipes',
                                   verbose_name='Список тегов')
-    cooking_time = models.PositiveIntegerField(
+    cooking_time = models.PositiveSmallIntegerField(
         'Время приготовления (в минутах)',
         default=1,
         validators=[MinValueValidator(1, 'Время готовки минимум одна минута')])
 
+    objects = RecipeQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        ordering = ('-id',)
+        indexes = [
+            models.Index(fields=['author', '-id'], name='recipe_author_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def add_ingredients(self, amounts):
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(
+                recipe=self,
+                ingredient_id=ingredient_id,
+                amount=amount
+            )
+            for ingredient_id, amount in amounts.items()
+        )
+
+    def set_ingredients(self, amounts):
+        existing = {
+            ingredient_in_recipe.ingredient_id: ingredient_in_recipe
+            for ingredient_in_recipe in self.ingredients_in_recipe.all()
+        }
+
+        IngredientInRecipe.objects.filter(
+            recipe=self,
+            ingredient_id__in=existing.keys() - amounts.keys()
+        ).delete()
+
+        changed = []
+        for ingredient_id, ingredient_in_recipe in existing.items():
+            amount = amounts.get(ingredient_id)
+            if amount is not None and amount != ingredient_in_recipe.amount:
+                ingredient_in_recipe.amount = amount
+                changed.append(ingredient_in_recipe)
+        IngredientInRecipe.objects.bulk_update(changed, ('amount',))
+
+        self.add_ingredients({
+            ingredient_id: amount
+            for ingredient_id, amount in amounts.items()
+            if ingredient_id not in existing
+        })
+
 
 class Tag(models.Model):
     name = models.CharField('Название', max_length=32, unique=True)
@@ -55,6 +125,10 @@ class Ingredient(models.Model):
     class Meta:
         verbose_name = 'Ингредиент'
         verbose_name_plural = 'Ингредиенты'
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'),
+                     name='ing_name_trgm_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name}, {self.measurement_unit}'
@@ -62,13 +136,14 @@ class Ingredient(models.Model):
 
 class IngredientInRecipe(models.Model):
     recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE,
-                               verbose_name='Рецепт', max_length=128,
+                               verbose_name='Рецепт',
                                related_name='ingredients_in_recipe')
     ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE,
-                                   verbose_name='Ингредиент', max_length=64,
+                                   verbose_name='Ингредиент',
                                    related_name='ingredients_in_recipe')
-    amount = models.PositiveIntegerField('Количество', default=1, validators=[
-        MinValueValidator(1, 'Должно быть минимум один')])
+    amount = models.PositiveSmallIntegerField(
+        'Количество', default=1, validators=[
+            MinValueValidator(1, 'Должно быть минимум один')])
 
     class Meta:
         verbose_name = 'Рецепт/Ингредиент'
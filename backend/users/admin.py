@@ -5,4 +5,6 @@ from users.models import Subscription
 
 @admin.register(Subscription)
 class SubscriptionAdmin(admin.ModelAdmin):
-    pass
+    list_display = ('user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
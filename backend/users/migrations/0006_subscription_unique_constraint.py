@@ -0,0 +1,22 @@
+# Generated by Django 3.2.3 on 2026-10-15 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_remove_customuser_role'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='username',
+            field=models.CharField(error_messages={'unique': 'Пользователь уже существует'}, max_length=150, unique=True, verbose_name='Уникальный юзернейм'),
+        ),
+        migrations.AddConstraint(
+            model_name='subscription',
+            constraint=models.UniqueConstraint(fields=('user', 'author'), name='unique_subscription'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.3 on 2026-10-15 11:37
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_subscription_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='subscription',
+            constraint=models.CheckConstraint(check=models.Q(('user', django.db.models.expressions.F('author')), _negated=True), name='no_self_subscription'),
+        ),
+    ]